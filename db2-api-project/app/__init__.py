@@ -1,6 +1,15 @@
+import os
+
 from litestar import Litestar
+from litestar.config.compression import CompressionConfig
 
 from app.controlers import AuthorController, BookController, ClientController, LoanController
-from app.database import sqlalchemy_config
+from app.database import sqlalchemy_config, warm_up_db_pool
 
-app = Litestar([AuthorController, BookController, ClientController, LoanController], debug=True, plugins=[sqlalchemy_config])
\ No newline at end of file
+app = Litestar(
+    [AuthorController, BookController, ClientController, LoanController],
+    debug=os.getenv("LITESTAR_DEBUG") == "1",
+    plugins=[sqlalchemy_config],
+    on_startup=[warm_up_db_pool],
+    compression_config=CompressionConfig(backend="brotli", brotli_quality=4, minimum_size=1024),
+)
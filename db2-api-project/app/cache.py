@@ -0,0 +1,37 @@
+from collections import OrderedDict
+from collections.abc import Callable
+from time import monotonic
+from typing import Generic, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class TTLCache(Generic[T]):
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._items: OrderedDict[Hashable, tuple[float, T]] = OrderedDict()
+
+    def get(self, key: Hashable) -> T | None:
+        item = self._items.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at < monotonic():
+            del self._items[key]
+            return None
+        self._items.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: T) -> None:
+        self._items[key] = (monotonic() + self.ttl, value)
+        self._items.move_to_end(key)
+        while len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        self._items.pop(key, None)
+
+    def delete_where(self, predicate: Callable[[T], bool]) -> None:
+        for key in [key for key, (_, value) in self._items.items() if predicate(value)]:
+            del self._items[key]
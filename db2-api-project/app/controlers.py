@@ -1,21 +1,27 @@
-from litestar import Controller, get, patch, post
+import msgspec
+from litestar import Controller, MediaType, Response, get, patch, post
+from litestar.datastructures import CacheControlHeader
 from litestar.di import Provide
 from litestar.dto import DTOData
 from litestar.exceptions import HTTPException
-from datetime import datetime, timedelta
+from litestar.repository.exceptions import NotFoundError
 
 from app.dtos import (
+    AuthorListDTO,
     AuthorReadDTO,
     AuthorReadFullDTO,
     AuthorUpdateDTO,
     AuthorWriteDTO,
+    BookListDTO,
     BookReadDTO,
+    BookRow,
     BookWriteDTO,
     ClientReadDTO,
     ClientWriteDTO,
     LoanReadDTO,
 )
 
+from app.middleware import ETagMiddleware
 from app.models import Author, Book, Client, Loan
 from app.repositories import (
     AuthorRepository,
@@ -28,6 +34,11 @@ from app.repositories import (
     provide_loans_repo,
 )
 
+CATALOG_CACHE_CONTROL = CacheControlHeader(public=True, max_age=60, stale_while_revalidate=30)
+NO_STORE_CACHE_CONTROL = CacheControlHeader.prevent_storing()
+
+json_encoder = msgspec.json.Encoder()
+
 
 class AuthorController(Controller):
     path = "/authors"
@@ -35,30 +46,34 @@ class AuthorController(Controller):
     return_dto = AuthorReadDTO
     dependencies = {"authors_repo": Provide(provide_authors_repo)}
 
-    @get()
+    @get(return_dto=AuthorListDTO)
     async def list_authors(self, authors_repo: AuthorRepository) -> list[Author]:
-        return authors_repo.list()
+        return await authors_repo.list_summary()
 
     @post(dto=AuthorWriteDTO)
     async def create_author(self, data: Author, authors_repo: AuthorRepository) -> Author:
-        return authors_repo.add(data)
-
-    @get("/{author_id:int}", return_dto=AuthorReadFullDTO)
+        return await authors_repo.add(data)
+
+    @get(
+        "/{author_id:int}",
+        return_dto=AuthorReadFullDTO,
+        middleware=[ETagMiddleware],
+        cache_control=CATALOG_CACHE_CONTROL,
+    )
     async def get_author(self, author_id: int, authors_repo: AuthorRepository) -> Author:
-        author = authors_repo.get(author_id)
+        author = await authors_repo.get_cached(author_id)
         if not author:
             raise HTTPException(404, detail="El autor no existe")
         return author
 
-    @patch("/{author_id:int}", dto=AuthorUpdateDTO)
+    @patch("/{author_id:int}", dto=AuthorUpdateDTO, cache_control=NO_STORE_CACHE_CONTROL)
     async def update_author(
         self, author_id: int, data: DTOData[Author], authors_repo: AuthorRepository
     ) -> Author:
-        author = authors_repo.get(author_id)
+        author = await authors_repo.update_fields(author_id, data.as_builtins())
         if not author:
             raise HTTPException(404, detail="El autor no existe")
-        author = data.update_instance(author)
-        return authors_repo.update(author)
+        return author
 
 
 class BookController(Controller):
@@ -67,33 +82,47 @@ class BookController(Controller):
     return_dto = BookReadDTO
     dependencies = {"books_repo": Provide(provide_books_repo)}
 
-    @get()
+    @get(return_dto=BookListDTO)
     async def list_books(self, books_repo: BookRepository) -> list[Book]:
-        books = books_repo.list()
+        books = await books_repo.list_summary()
         if not books:
             raise HTTPException(404, detail="No hay libros disponibles")
         return books
 
-    @get("/{book_id:int}", return_dto=BookReadDTO)
+    @get("/rows", return_dto=None)
+    async def list_book_rows(self, books_repo: BookRepository) -> Response[bytes]:
+        rows = [BookRow(*row) for row in await books_repo.list_as_rows()]
+        if not rows:
+            raise HTTPException(404, detail="No hay libros disponibles")
+        return Response(json_encoder.encode(rows), media_type=MediaType.JSON)
+
+    @get(
+        "/{book_id:int}",
+        return_dto=BookReadDTO,
+        middleware=[ETagMiddleware],
+        cache_control=CATALOG_CACHE_CONTROL,
+    )
     async def get_book(self, book_id: int, books_repo: BookRepository) -> Book:
-        book = books_repo.get(book_id)
+        book = await books_repo.get_cached(book_id)
         if not book:
             raise HTTPException(404, detail="El libro no existe")
         return book
 
-    @patch("/{book_id:int}", dto=BookWriteDTO)
+    @patch("/{book_id:int}", dto=BookWriteDTO, cache_control=NO_STORE_CACHE_CONTROL)
     async def update_book(
         self, book_id: int, data: DTOData[Book], books_repo: BookRepository
     ) -> Book:
-        book = books_repo.get(book_id)
+        try:
+            book = await books_repo.update_fields(book_id, data.as_builtins())
+        except NotFoundError:
+            raise HTTPException(400, detail="Alguna de las categorías no existe")
         if not book:
             raise HTTPException(404, detail="El libro no existe")
-        book = data.update_instance(book)
-        return books_repo.update(book)
+        return book
 
-    @get("/search", return_dto=BookReadDTO)
+    @get("/search", return_dto=BookListDTO, cache_control=CATALOG_CACHE_CONTROL)
     async def search_books(self, title: str, books_repo: BookRepository) -> list[Book]:
-        books = books_repo.search_by_title(title)
+        books = await books_repo.search_by_title(title)
         if not books:
             raise HTTPException(404, detail="No se encontraron libros con ese título")
         return books
@@ -107,14 +136,14 @@ class ClientController(Controller):
 
     @get()
     async def list_clients(self, clients_repo: ClientRepository) -> list[Client]:
-        clients = clients_repo.list()
+        clients = await clients_repo.list()
         if not clients:
             raise HTTPException(404, detail="No hay clientes disponibles")
         return clients
 
     @post(dto=ClientWriteDTO)
     async def create_client(self, data: Client, clients_repo: ClientRepository) -> Client:
-        return clients_repo.add(data)
+        return await clients_repo.add(data)
 
 
 class LoanController(Controller):
@@ -129,21 +158,17 @@ class LoanController(Controller):
         book_id: int,
         client_id: int,
         loans_repo: LoanRepository,
-        books_repo: BookRepository,
-        clients_repo: ClientRepository,
     ) -> Loan:
-        book = books_repo.get(book_id)
-        client = clients_repo.get(client_id)
+        book_exists, client_exists, book_available = await loans_repo.precheck(book_id, client_id)
 
-        if not book or not client:
+        if not book_exists or not client_exists:
             raise HTTPException(404, detail="El libro o el cliente no existe")
 
-        if books_repo.is_book_available(book_id):
+        if not book_available:
             raise HTTPException(400, detail="No hay copias disponibles para préstamo")
 
-        loan_date = datetime.utcnow()
-        loan = Loan(book_id=book_id, client_id=client_id, loan_date=loan_date)
-        loans_repo.add(loan)
+        loan = Loan(book_id=book_id, client_id=client_id)
+        await loans_repo.add(loan)
 
         return loan
 
@@ -153,20 +178,11 @@ class LoanController(Controller):
         loan_id: int,
         loans_repo: LoanRepository,
     ) -> Loan:
-        loan = loans_repo.get(loan_id)
+        loan = await loans_repo.mark_returned(loan_id)
 
         if not loan:
+            if await loans_repo.exists(id=loan_id):
+                raise HTTPException(400, detail="El libro ya ha sido devuelto")
             raise HTTPException(404, detail="El préstamo no existe")
 
-        if loan.return_date:
-            raise HTTPException(400, detail="El libro ya ha sido devuelto")
-
-        return_date = datetime.utcnow()
-        loan.return_date = return_date
-
-        due_date = loan.loan_date + timedelta(days=7)
-        if return_date > due_date:
-            days_overdue = (return_date - due_date).days
-            loan.fine = days_overdue * 0.5
-
-        return loans_repo.update(loan)
\ No newline at end of file
+        return loan
\ No newline at end of file
@@ -1,13 +1,35 @@
 import os
+from contextlib import AsyncExitStack
 
+from litestar import Litestar
 from litestar.contrib.sqlalchemy.plugins import (
+    AsyncSessionConfig,
+    EngineConfig,
+    SQLAlchemyAsyncConfig,
     SQLAlchemyPlugin,
-    SQLAlchemySyncConfig,
-    SyncSessionConfig,
 )
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
 
-db_config = SQLAlchemySyncConfig(
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_POOL_WARM_SIZE = int(os.getenv("DB_POOL_WARM_SIZE", "10"))
+
+db_config = SQLAlchemyAsyncConfig(
     connection_string=os.environ["DATABASE_URL"],
-    session_config=SyncSessionConfig(expire_on_commit=False),
+    engine_config=EngineConfig(
+        pool_size=DB_POOL_SIZE,
+        max_overflow=int(os.getenv("DB_POOL_MAX_OVERFLOW", "10")),
+        pool_pre_ping=True,
+        pool_recycle=1800,
+    ),
+    session_config=AsyncSessionConfig(expire_on_commit=False),
 )
 sqlalchemy_config = SQLAlchemyPlugin(config=db_config)
+
+
+async def warm_up_db_pool(app: Litestar) -> None:
+    engine: AsyncEngine = app.state[db_config.engine_app_state_key]
+    async with AsyncExitStack() as stack:
+        for _ in range(min(DB_POOL_WARM_SIZE, DB_POOL_SIZE)):
+            connection = await stack.enter_async_context(engine.connect())
+            await connection.execute(text("SELECT 1"))
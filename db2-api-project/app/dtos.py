@@ -1,3 +1,4 @@
+import msgspec
 from litestar.contrib.sqlalchemy.dto import SQLAlchemyDTO, SQLAlchemyDTOConfig
 
 from app.models import Author, Book, Client, Loan
@@ -7,6 +8,10 @@ class AuthorReadDTO(SQLAlchemyDTO[Author]):
     config = SQLAlchemyDTOConfig(exclude={"books"})
 
 
+class AuthorListDTO(SQLAlchemyDTO[Author]):
+    config = SQLAlchemyDTOConfig(exclude={"biography", "books"})
+
+
 class AuthorReadFullDTO(SQLAlchemyDTO[Author]):
     pass
 
@@ -23,6 +28,19 @@ class BookReadDTO(SQLAlchemyDTO[Book]):
     pass
 
 
+class BookListDTO(SQLAlchemyDTO[Book]):
+    config = SQLAlchemyDTOConfig(exclude={"description", "author", "categories"})
+
+
+class BookRow(msgspec.Struct, array_like=True):
+    id: int
+    isbn: str
+    title: str
+    year: int
+    language: str
+    author_id: int
+
+
 class BookWriteDTO(SQLAlchemyDTO[Book]):
     config = SQLAlchemyDTOConfig(exclude={"id", "author"})
 
@@ -0,0 +1,50 @@
+from hashlib import blake2b
+
+from litestar.datastructures import Headers, MutableScopeHeaders
+from litestar.enums import ScopeType
+from litestar.middleware import AbstractMiddleware
+from litestar.types import Message, Receive, Scope, Send
+
+
+class ETagMiddleware(AbstractMiddleware):
+    scopes = {ScopeType.HTTP}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match = {
+            tag.strip().removeprefix("W/")
+            for tag in Headers.from_scope(scope).get("if-none-match", "").split(",")
+        }
+        start_message: Message | None = None
+        body = bytearray()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+
+            body.extend(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            headers = MutableScopeHeaders(start_message)
+            if start_message["status"] == 200:
+                etag = f'"{blake2b(body, digest_size=16).hexdigest()}"'
+                # weak, since the compression middleware may re-encode the body
+                headers["etag"] = f"W/{etag}"
+                if etag in if_none_match or "*" in if_none_match:
+                    start_message["status"] = 304
+                    del headers["content-length"]
+                    body.clear()
+
+            await send(start_message)
+            await send({"type": "http.response.body", "body": bytes(body), "more_body": False})
+
+        await self.app(scope, receive, send_wrapper)
@@ -1,8 +1,7 @@
 from datetime import date, datetime, timedelta
 from typing import Optional
 from litestar.exceptions import HTTPException
-from passlib.hash import argon2
-from sqlalchemy import Column, String
+from sqlalchemy import Column, Computed, DateTime, Index, String, func, text
 from sqlalchemy import ForeignKey
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
@@ -13,6 +12,14 @@ class Base(DeclarativeBase):
 
 class Book(Base):
     __tablename__ = "books"
+    __table_args__ = (
+        Index(
+            "ix_books_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     isbn: Mapped[str] = mapped_column(index=True)
@@ -68,10 +75,22 @@ class Client(Base):
 
 class Loan(Base):
     __tablename__= "loans"
+    __table_args__ = (
+        Index("ix_loans_book_open", "book_id", postgresql_where=text("return_date IS NULL")),
+        Index("ix_loans_client_open", "client_id", postgresql_where=text("return_date IS NULL")),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     book_id: Mapped[int] = mapped_column(ForeignKey("books.id"))
     client_id: Mapped[int] = mapped_column(ForeignKey("clients.id"))
-    loan_date: Mapped[datetime] = mapped_column(default=datetime.utcnow)
-    return_date: Mapped[Optional[datetime]] = mapped_column(nullable=True)
-    fine: Mapped[Optional[float]] = mapped_column(nullable=True)
\ No newline at end of file
+    loan_date: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    return_date: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    fine: Mapped[Optional[float]] = mapped_column(
+        Computed(
+            "CASE WHEN return_date - loan_date > INTERVAL '7 days' THEN "
+            "floor(extract(epoch FROM return_date - loan_date - INTERVAL '7 days') / 86400) * 0.5 "
+            "END",
+            persisted=True,
+        ),
+        nullable=True,
+    )
\ No newline at end of file
@@ -1,36 +1,267 @@
-from litestar.contrib.sqlalchemy.repository import SQLAlchemySyncRepository
-from sqlalchemy.orm import Session
+from collections.abc import Sequence
+from typing import Any
 
+from litestar import Litestar, Request
+from litestar.contrib.sqlalchemy.repository import (
+    ModelT,
+    SQLAlchemyAsyncRepository,
+    wrap_sqlalchemy_exception,
+)
+from litestar.repository.exceptions import NotFoundError
+from sqlalchemy import Select, exists, func, insert, inspect, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import RelationshipProperty, load_only, raiseload, selectinload
+from sqlalchemy.sql.base import ExecutableOption
+
+from app.cache import TTLCache
 from app.models import Author, Book, Client, Loan
 
 
-class AuthorRepository(SQLAlchemySyncRepository[Author]):
+def strict_loading(app: Litestar) -> tuple:
+    return (raiseload("*"),) if app.debug else ()
+
+
+class Repository(SQLAlchemyAsyncRepository[ModelT]):
+    update_options: tuple[ExecutableOption, ...] = ()
+
+    def __init__(
+        self,
+        *,
+        load_options: Sequence[ExecutableOption] = (),
+        strict_options: Sequence[ExecutableOption] = (),
+        **kwargs: Any,
+    ) -> None:
+        self.strict_options = tuple(strict_options)
+        self.load_options = (*load_options, *self.strict_options)
+        super().__init__(statement=select(self.model_type).options(*self.load_options), **kwargs)
+
+    async def get(
+        self,
+        item_id: Any,
+        auto_expunge: bool | None = None,
+        statement: Select[tuple[ModelT]] | None = None,
+        id_attribute: str | None = None,
+    ) -> ModelT:
+        if statement is not None or id_attribute not in (None, self.id_attribute):
+            return await super().get(item_id, auto_expunge, statement, id_attribute)
+        with wrap_sqlalchemy_exception():
+            item = await self.session.get(self.model_type, item_id, options=self.load_options)
+            item = self.check_not_found(item)
+            self._expunge(item, auto_expunge=auto_expunge)
+            return item
+
+    async def get_or_none(self, item_id: Any) -> ModelT | None:
+        try:
+            return await self.get(item_id)
+        except NotFoundError:
+            return None
+
+    async def update_fields(self, item_id: int, values: dict[str, Any]) -> ModelT | None:
+        relationships = self.model_type.__mapper__.relationships
+        columns = {key: value for key, value in values.items() if key not in relationships}
+        related = {
+            key: await self._load_related(relationships[key], value)
+            for key, value in values.items()
+            if key in relationships
+        }
+        if not columns:
+            item = await self.get_or_none(item_id)
+            if item is None or not related:
+                return item
+        with wrap_sqlalchemy_exception():
+            if columns:
+                item = await self.session.scalar(
+                    update(self.model_type)
+                    .where(getattr(self.model_type, self.id_attribute) == item_id)
+                    .values(**columns)
+                    .returning(self.model_type)
+                    .options(*self.update_options, *self.strict_options)
+                )
+                if item is None:
+                    return None
+            for key, value in related.items():
+                setattr(item, key, value)
+            await self._flush_or_commit(auto_commit=None)
+            return item
+
+    async def _load_related(self, relationship: RelationshipProperty, value: Any) -> Any:
+        # the DTO hands over transient instances; swap them for the persistent rows
+        mapper = relationship.mapper
+        items = value if relationship.uselist else [value]
+        ids = {mapper.primary_key_from_instance(item)[0] for item in items if item is not None}
+        with wrap_sqlalchemy_exception():
+            rows = (
+                await self.session.scalars(
+                    select(mapper.class_).where(mapper.primary_key[0].in_(ids))
+                )
+            ).all()
+        if len(rows) != len(ids):
+            raise NotFoundError(f"No {mapper.class_.__name__} found for some of the given ids")
+        return list(rows) if relationship.uselist else next(iter(rows), None)
+
+
+class CachedRepository(Repository[ModelT]):
+    cache: TTLCache[ModelT]
+
+    async def get_cached(self, item_id: int) -> ModelT | None:
+        item = self.cache.get(item_id)
+        if item is None:
+            item = await self.get_or_none(item_id)
+            if item is not None:
+                self._detach(item)
+                self.cache.set(item_id, item)
+        return item
+
+    def _detach(self, item: ModelT) -> None:
+        # cached instances outlive the request, so neither they nor their loaded
+        # relationships may stay attached to this request's session
+        state = inspect(item)
+        for relationship in state.mapper.relationships:
+            if relationship.key in state.unloaded:
+                continue
+            value = state.dict.get(relationship.key)
+            for related in value if isinstance(value, list) else [value]:
+                if related is not None and related in self.session:
+                    self.session.expunge(related)
+        self.session.expunge(item)
+
+    async def update_fields(self, item_id: int, values: dict[str, Any]) -> ModelT | None:
+        item = await super().update_fields(item_id, values)
+        self.cache.delete(item_id)
+        return item
+
+
+class AuthorRepository(CachedRepository[Author]):
     model_type = Author
+    cache: TTLCache[Author] = TTLCache(maxsize=10_000, ttl=30)
+
+    async def list_summary(self) -> list[Author]:
+        return await self.list(
+            statement=select(Author).options(
+                load_only(Author.id, Author.name, Author.date_of_birth), *self.strict_options
+            )
+        )
+
+    async def update_fields(self, author_id: int, values: dict[str, Any]) -> Author | None:
+        author = await super().update_fields(author_id, values)
+        BookRepository.cache.delete_where(lambda book: book.author_id == author_id)
+        return author
 
 
-async def provide_authors_repo(db_session: Session):
-    return AuthorRepository(session=db_session, auto_commit=True)
+async def provide_authors_repo(db_session: AsyncSession, request: Request):
+    return AuthorRepository(
+        session=db_session,
+        auto_commit=True,
+        load_options=(selectinload(Author.books),),
+        strict_options=strict_loading(request.app),
+    )
 
 
-class BookRepository(SQLAlchemySyncRepository[Book]):
+class BookRepository(CachedRepository[Book]):
     model_type = Book
+    cache: TTLCache[Book] = TTLCache(maxsize=10_000, ttl=30)
+    update_options = (selectinload(Book.author), selectinload(Book.categories))
+
+    summary_columns = (Book.id, Book.isbn, Book.title, Book.year, Book.language, Book.author_id)
+
+    @property
+    def summary_statement(self) -> Select[tuple[Book]]:
+        return select(Book).options(load_only(*self.summary_columns), *self.strict_options)
+
+    async def update_fields(self, book_id: int, values: dict[str, Any]) -> Book | None:
+        book = await super().update_fields(book_id, values)
+        AuthorRepository.cache.delete_where(
+            lambda author: any(b.id == book_id for b in author.books)
+        )
+        if book is not None:
+            AuthorRepository.cache.delete(book.author_id)
+        return book
 
+    async def list_summary(self) -> list[Book]:
+        return await self.list(statement=self.summary_statement)
 
-async def provide_books_repo(db_session: Session):
-    return BookRepository(session=db_session, auto_commit=True)
+    async def list_as_rows(self) -> list[tuple]:
+        with wrap_sqlalchemy_exception():
+            result = await self.session.execute(select(*self.summary_columns))
+            return result.tuples().all()
 
+    async def search_by_title(self, title: str) -> list[Book]:
+        return await self.list(
+            Book.title.icontains(title, autoescape=True),
+            statement=self.summary_statement.order_by(
+                func.similarity(Book.title, title).desc()
+            ).limit(50),
+        )
 
-class ClientRepository(SQLAlchemySyncRepository[Client]):
+
+async def provide_books_repo(db_session: AsyncSession, request: Request):
+    return BookRepository(
+        session=db_session,
+        auto_commit=True,
+        load_options=(selectinload(Book.author), selectinload(Book.categories)),
+        strict_options=strict_loading(request.app),
+    )
+
+
+class ClientRepository(Repository[Client]):
     model_type = Client
 
 
-async def provide_clients_repo(db_session: Session):
+async def provide_clients_repo(db_session: AsyncSession):
     return ClientRepository(session=db_session, auto_commit=True)
 
 
-class LoanRepository(SQLAlchemySyncRepository[Loan]):
+class LoanRepository(Repository[Loan]):
     model_type = Loan
 
+    async def precheck(self, book_id: int, client_id: int) -> tuple[bool, bool, bool]:
+        result = await self.session.execute(
+            select(
+                exists().where(Book.id == book_id),
+                exists().where(Client.id == client_id),
+                ~exists().where(Loan.book_id == book_id, Loan.return_date.is_(None)),
+            )
+        )
+        book_exists, client_exists, book_available = result.one()
+        return book_exists, client_exists, book_available
+
+    async def add_many(
+        self,
+        data: list[Loan],
+        auto_commit: bool | None = None,
+        auto_expunge: bool | None = None,
+    ) -> list[Loan]:
+        if not data:
+            return []
+        values = [
+            {
+                column.key: getattr(loan, column.key)
+                for column in Loan.__mapper__.column_attrs
+                if getattr(loan, column.key) is not None
+            }
+            for loan in data
+        ]
+        with wrap_sqlalchemy_exception():
+            loans = await self.session.scalars(
+                insert(Loan).returning(Loan, sort_by_parameter_order=True), values
+            )
+            loans = loans.all()
+            await self._flush_or_commit(auto_commit=auto_commit)
+            for loan in loans:
+                self._expunge(loan, auto_expunge=auto_expunge)
+            return loans
+
+    async def mark_returned(self, loan_id: int) -> Loan | None:
+        with wrap_sqlalchemy_exception():
+            loan = await self.session.scalar(
+                update(Loan)
+                .where(Loan.id == loan_id, Loan.return_date.is_(None))
+                .values(return_date=func.now())
+                .returning(Loan)
+            )
+            await self._flush_or_commit(auto_commit=None)
+            return loan
+
 
-async def provide_loans_repo(db_session: Session):
-    return LoanRepository(session=db_session, auto_commit=True)
\ No newline at end of file
+async def provide_loans_repo(db_session: AsyncSession):
+    return LoanRepository(session=db_session, auto_commit=True)
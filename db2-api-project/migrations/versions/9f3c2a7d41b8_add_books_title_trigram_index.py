@@ -0,0 +1,33 @@
+"""Add books.title trigram index
+
+Revision ID: 9f3c2a7d41b8
+Revises: 2c68bdc132be
+Create Date: 2026-10-15 10:12:31.482905
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9f3c2a7d41b8"
+down_revision: Union[str, None] = "2c68bdc132be"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        "ix_books_title_trgm",
+        "books",
+        ["title"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"title": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_books_title_trgm", table_name="books")
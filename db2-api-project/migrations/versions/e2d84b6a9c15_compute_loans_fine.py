@@ -0,0 +1,49 @@
+"""Compute loans.fine in the database
+
+Revision ID: e2d84b6a9c15
+Revises: c7a95e13d2f0
+Create Date: 2026-10-15 12:16:44.630582
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e2d84b6a9c15"
+down_revision: Union[str, None] = "c7a95e13d2f0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # PostgreSQL cannot turn an existing column into a generated one, so it is recreated
+    op.drop_column("loans", "fine")
+    op.add_column(
+        "loans",
+        sa.Column(
+            "fine",
+            sa.Float(),
+            sa.Computed(
+                "CASE WHEN return_date - loan_date > INTERVAL '7 days' THEN "
+                "floor(extract(epoch FROM return_date - loan_date - INTERVAL '7 days') / 86400) "
+                "* 0.5 "
+                "END",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("loans", "fine")
+    op.add_column("loans", sa.Column("fine", sa.Float(), nullable=True))
+    op.execute(
+        "UPDATE loans "
+        "SET fine = "
+        "floor(extract(epoch FROM return_date - loan_date - INTERVAL '7 days') / 86400) * 0.5 "
+        "WHERE return_date - loan_date > INTERVAL '7 days'"
+    )